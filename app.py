@@ -3,10 +3,10 @@
 app.py - FIUS-Based Infant Presence Detection GUI
 
 Key features:
-- Runs ADC->FFT conversion notebooks (papermill)
-- Runs training notebooks (papermill)
-- Renders FFT plots from saved numpy arrays off the main thread (matplotlib Agg),
-  sends PNG bytes to main thread for Tk display (avoids Tk use in worker threads)
+- Runs ADC->FFT conversion notebooks (papermill, in-process API)
+- Runs training notebooks (papermill, in-process API)
+- Renders FFT plots from saved numpy arrays off the main thread (Pillow rasteriser),
+  sends PIL images to main thread for Tk display (avoids Tk use in worker threads)
 - After training, displays executed notebook cell outputs in the "Confusion Matrix"
   tab (reads executed notebook if present, otherwise runs papermill to create executed file)
 - Robust thread/process tracking and safe shutdown to avoid Tk runtime errors on exit
@@ -15,52 +15,161 @@ Key features:
 import tkinter as tk
 from tkinter import scrolledtext, ttk
 import threading
+import weakref
+from functools import lru_cache
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, wait
 import numpy as np
-import matplotlib
-# Ensure matplotlib uses Agg backend (not tkinter) when rendering in worker threads
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-
-from PIL import Image, ImageTk
-from io import BytesIO
+from PIL import Image, ImageDraw, ImageFont, ImageTk
 import os
-import sys
 import subprocess
-import nbformat
-import papermill as pm
+import io
+import logging
+import re
+import hashlib
+import importlib.util
+import json
+import shutil
 import time
+from pathlib import Path
+from types import SimpleNamespace
+
+try:
+    import orjson       # optional: faster parsing of large executed notebooks
+except ImportError:
+    orjson = None
 
 # --------------------------
 # Globals / state
 # --------------------------
 fft_img_tks = []        # keep references to PhotoImage so they don't get GC'd
-fft_img_labels = []     # keep Label widgets so we can destroy them on shutdown
+MAX_FFT_IMAGES = 16     # cap on plots shown at once; each PhotoImage is ~w*h*4 bytes in Tk
+fft_img_items = []      # image items on fft_canvas, reused by the next set of plots
+FFT_IMG_PAD = 5         # px around each plot on fft_canvas
+fft_view_width = 0      # usable plot width in the FFT tab, tracked from its canvas; 0 = unknown
 cm_output_box = None    # will hold the ScrolledText widget for notebook output
+cm_shown_key = None     # (path, mtime_ns, size) of the executed notebook shown in cm_output_box
 output_box = None       # per-task logging area in the task window
 root = None
 
-# Track worker threads and spawned subprocesses (for safe shutdown)
-worker_threads = set()
+# Track background work and spawned subprocesses (for safe shutdown)
+# Background work (task pipelines, plot rendering, notebook output) runs on one shared pool
+TASK_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fius-task")
+worker_futures = weakref.WeakSet()   # finished futures drop out on their own
 spawned_processes = set()
-app_closing = False
+app_closing = threading.Event()   # set once on shutdown; checked between notebooks/plots
 lock = threading.Lock()
 
+# --------------------------
+# Paths and task definitions (resolved once at startup)
+# --------------------------
+# Defaults follow the repository layout next to this file; FIUS_* environment variables
+# override them for checkouts that keep notebooks or data elsewhere.
+_SOURCE_ROOT = Path(os.environ.get("FIUS_SOURCE_ROOT",
+                                   Path(__file__).resolve().parent / "source_code")).resolve()
+PATHS = SimpleNamespace(
+    conv_dir=Path(os.environ.get("FIUS_CONV_DIR", _SOURCE_ROOT / "Notebooks" / "Exploration")).resolve(),
+    train_dir=Path(os.environ.get("FIUS_TRAIN_DIR", _SOURCE_ROOT / "Notebooks" / "Training")).resolve(),
+    processed_dir=Path(os.environ.get("FIUS_PROCESSED_DIR", _SOURCE_ROOT / "Data" / "Processed")).resolve(),
+    raw_dir=Path(os.environ.get("FIUS_RAW_DIR", _SOURCE_ROOT / "Data" / "Raw")).resolve(),
+)
+
+# ADC -> FFT conversion notebooks with per-notebook label info
+CONVERSION_MAP = {
+    "Task1": [
+        {"notebook": "ADC to FFT Emptyseat.ipynb", "label_column_name": "Object_Presence", "label_value": 0},
+        {"notebook": "ADC to FFT Carrierseat.ipynb", "label_column_name": "Object_Presence", "label_value": 1},
+    ],
+    "Task2": [
+        {"notebook": "ADC to FFT Carrierseat.ipynb", "label_column_name": "Infant_Presence", "label_value": 0},
+        {"notebook": "ADC to FFT Withbaby.ipynb", "label_column_name": "Infant_Presence", "label_value": 1},
+    ],
+    "Task3": [
+        {"notebook": "ADC to FFT Blanket and Sunscreen.ipynb", "label_column_name": "Infant_Presence", "label_value": 1},
+    ],
+}
+
+# Raw CSV folder (under PATHS.raw_dir) and output array name of each conversion notebook;
+# when the folder exists, source_code/adc_to_fft.py does the conversion without a kernel
+ADC_SOURCES = {
+    "ADC to FFT Emptyseat.ipynb": ("Emptyseat", "Emptyseat_npy_array_Lowpassfiltered_label.npy"),
+    "ADC to FFT Carrierseat.ipynb": ("CarrierSeat",
+                                     "CarrierSeat_Lowpassfiltered_Label_{label_value}_{label_column_name}.npy"),
+    "ADC to FFT Withbaby.ipynb": ("Withbaby", "Withbaby_npy_array_Lowpassfiltered.npy"),
+    "ADC to FFT Blanket and Sunscreen.ipynb": ("Baby covered in Blanket and Sunscreen",
+                                               "BabyCovered_with_Blanket_or_Sunscreen_npy_array_Lowpassfiltered_label.npy"),
+}
+
+# numpy arrays plotted in the FFT tab for each task (Task1's carrier-seat array is the
+# Object_Presence = 1 one its training notebook reads; the notebook itself resets its
+# injected parameters and always writes the Label_0_Infant_Presence array)
+TASK_FFT_FILES = {
+    task: tuple(PATHS.processed_dir / name for name in names)
+    for task, names in {
+        "Task1": ["Emptyseat_npy_array_Lowpassfiltered_label.npy",
+                  "CarrierSeat_Lowpassfiltered_Label_1_Object_Presence.npy"],
+        "Task2": ["CarrierSeat_Lowpassfiltered_Label_0_Infant_Presence.npy",
+                  "Withbaby_npy_array_Lowpassfiltered.npy"],
+        "Task3": ["Blanket_and_Sunscreen_npy_array_Lowpassfiltered_Label_1.npy"],
+    }.items()
+}
+
+TRAINING_MAP = {
+    "Task1": ["Task1_Empty seat or carrier seat Classification using XG Boost model and MLP model.ipynb"],
+    "Task2": ["Task2_With or without baby Detection using RanFor model and SVM model.ipynb"],
+    "Task3": ["Task3_Baby presence detection when covered in blanket or sunscreen.ipynb"],
+}
+
+def _nb_job(notebooks_path, nb, parameters):
+    """One unit of notebook work: (name, parameters, input path, executed output path)."""
+    return (nb, parameters, notebooks_path / nb, notebooks_path / ("executed_" + nb))
+
+# Resolved once: every notebook a task may execute, as ready-to-run jobs.
+# conversion[i] belongs to CONVERSION_MAP[task][i].
+TASK_JOBS = {
+    task: SimpleNamespace(
+        conversion=tuple(
+            _nb_job(PATHS.conv_dir, info["notebook"], {
+                "label_column_name": info["label_column_name"],
+                "label_value": info["label_value"],
+            })
+            for info in CONVERSION_MAP.get(task, [])
+        ),
+        training=tuple(_nb_job(PATHS.train_dir, nb, {}) for nb in TRAINING_MAP.get(task, [])),
+    )
+    for task in CONVERSION_MAP.keys() | TRAINING_MAP.keys()
+}
+
+# task -> time.time() of its last fully successful run this session; a task whose notebooks
+# and processed arrays are all older than that just redisplays its results
+task_done = {}
+
+# Executed-notebook cache: <notebook dir>/.nbcache/<stem>.<key>.ipynb
+NB_CACHE_DIR = ".nbcache"
+NB_CACHE_KEEP = 3       # most-recent executed copies kept per source notebook
+
+# Display text of executed notebooks, keyed by (path, mtime_ns, size); oldest evicted first
+_nb_text_cache = OrderedDict()
+NB_TEXT_CACHE_MAX = 8
+CM_TEXT_MAX_CHARS = 500_000     # only this tail of a notebook's output goes into the Text widget
+
 # --------------------------
 # Thread/process helpers
 # --------------------------
 def start_worker(target, *args, **kwargs):
-    """Start a non-daemon worker thread and track it."""
-    t = threading.Thread(target=target, args=args, kwargs=kwargs)
-    t.start()
-    with lock:
-        worker_threads.add(t)
-
-    def _watch(_t=t):
-        _t.join()
+    """Run target on the shared TASK_POOL and track its future until it finishes."""
+    def _done(f):
         with lock:
-            worker_threads.discard(_t)
-    threading.Thread(target=_watch, daemon=True).start()
-    return t
+            worker_futures.discard(f)
+        if not f.cancelled() and f.exception() is not None:
+            # a pool swallows exceptions that a plain thread would have printed
+            log(f"Worker error: {f.exception()}")
+
+    with lock:
+        f = TASK_POOL.submit(target, *args, **kwargs)
+        worker_futures.add(f)
+    f.add_done_callback(_done)
+    return f
 
 def register_process(p: subprocess.Popen):
     with lock:
@@ -73,118 +182,656 @@ def unregister_process(p: subprocess.Popen):
 # --------------------------
 # Safe logging to task output box
 # --------------------------
+_log_buf = deque()      # append/popleft are atomic under the GIL, no lock needed
+LOG_DRAIN_MS = 50       # flush delay: lines arriving within it share one insert
+LOG_DRAIN_MAX = 500     # max lines inserted per flush, keeps each Tk callback short
+_drain_pending = False  # a _drain_log call is scheduled; guarded by lock
+
+def _schedule_drain():
+    global _drain_pending
+    with lock:
+        if _drain_pending or root is None or app_closing.is_set():
+            return
+        _drain_pending = True
+    try:
+        root.after(LOG_DRAIN_MS, _drain_log)
+    except Exception:
+        # root already destroyed
+        with lock:
+            _drain_pending = False
+
 def log(msg: str):
-    """Append message to the task output box safely from any thread."""
-    if output_box is None or root is None:
-        return
-    def _do():
+    """Queue a message for the task output box; safe to call from any thread."""
+    _log_buf.append(msg)
+    _schedule_drain()
+
+def _drain_log():
+    """Main thread: move queued log lines into output_box with a single insert."""
+    global _drain_pending
+    # clear the flag before popping, so a line appended after the pops schedules a new drain
+    with lock:
+        _drain_pending = False
+    # popleft rather than swapping the deque: a producer holding the old deque could
+    # otherwise append after it was drained and lose the line
+    lines = []
+    while _log_buf and len(lines) < LOG_DRAIN_MAX:
+        lines.append(_log_buf.popleft())
+    if lines and output_box is not None:
         try:
             if output_box.winfo_exists():
-                output_box.insert(tk.END, msg + "\n")
+                output_box.insert(tk.END, "\n".join(lines) + "\n")
                 output_box.see(tk.END)
         except Exception:
             pass
-    root.after(0, _do)
+    if _log_buf:
+        _schedule_drain()   # more than LOG_DRAIN_MAX lines were queued
+
+_log_context = threading.local()    # .prefix tags lines from concurrently running notebooks
+
+_CELL_BANNER_RE = re.compile(r"^(Executing|Ending) Cell \d+-*$")
+
+def _collapse_cr(text):
+    """Keep only what a terminal would show: the last \r-separated segment of each line."""
+    if "\r" not in text:
+        return text
+    return "\n".join(line.rstrip("\r").rsplit("\r", 1)[-1] for line in text.split("\n"))
+
+class _TaskLogHandler(logging.Handler):
+    """Forward papermill's logger (cell output) into the task output box."""
+    def emit(self, record):
+        try:
+            msg = record.getMessage()
+            # per-cell "Executing Cell 3----" banners are pure progress noise, one pair per cell
+            if _CELL_BANNER_RE.match(msg):
+                return
+            msg = _collapse_cr(msg)
+            prefix = getattr(_log_context, "prefix", "")
+            if prefix:
+                # every line, so interleaved output of concurrent notebooks stays attributable
+                msg = "\n".join(prefix + line for line in msg.splitlines())
+            log(msg)
+        except Exception:
+            self.handleError(record)
+
+_pm_logger = logging.getLogger("papermill")
+_pm_logger.setLevel(logging.INFO)
+_pm_logger.addHandler(_TaskLogHandler())
+
+# --------------------------
+# In-process notebook execution
+# --------------------------
+KERNEL_NAME = "python3"
+_idle_kernels = []      # warm KernelManagers not currently executing a notebook
+_all_kernels = []       # every kernel the app started; shut down in on_close
+
+def _acquire_kernel():
+    """
+    Take a warm kernel from the pool (its namespace reset, its imports still cached) or
+    start a new one. Concurrent notebooks each get their own kernel.
+    """
+    while True:
+        with lock:
+            km = _idle_kernels.pop() if _idle_kernels else None
+        if km is None:
+            break
+        try:
+            if km.is_alive():
+                kc = km.client()
+                kc.start_channels()
+                try:
+                    kc.wait_for_ready(timeout=30)
+                    kc.execute_interactive("%reset -f", store_history=False, timeout=30)
+                finally:
+                    kc.stop_channels()
+                return km
+        except Exception as e:
+            log(f"Discarding unusable kernel: {e}")
+        _discard_kernel(km)
+
+    from jupyter_client.manager import KernelManager
+    km = KernelManager(kernel_name=KERNEL_NAME)
+    km.start_kernel()
+    with lock:
+        _all_kernels.append(km)
+    # also track the kernel's OS process, so on_close can still kill one that ignores shutdown
+    proc = getattr(getattr(km, "provisioner", None), "process", None)
+    if proc is not None:
+        register_process(proc)
+    return km
+
+def _release_kernel(km):
+    """Return a kernel to the pool once its notebook finished."""
+    with lock:
+        if not app_closing.is_set():
+            _idle_kernels.append(km)
+
+def _discard_kernel(km):
+    with lock:
+        if km in _all_kernels:
+            _all_kernels.remove(km)
+    proc = getattr(getattr(km, "provisioner", None), "process", None)
+    try:
+        km.shutdown_kernel(now=True)
+    except Exception:
+        pass
+    if proc is not None and proc.poll() is not None:
+        unregister_process(proc)
+
+def shutdown_kernels():
+    """Shut down every kernel the pool started (called on app close)."""
+    with lock:
+        kms = list(_all_kernels)
+        _idle_kernels.clear()
+    for km in kms:
+        _discard_kernel(km)
+
+_PM_ENGINE = "fius_pooled_kernel"
+_pm_engine_registered = False
+
+def _register_pm_engine():
+    """
+    Register a papermill engine for pooled kernels. With km= passed in, nbclient does not own
+    the kernel and never stops the client it opened on it, leaking a heartbeat thread and
+    its ZMQ sockets per run; this engine stops that client once the notebook is done.
+    """
+    global _pm_engine_registered
+    with lock:
+        if _pm_engine_registered:
+            return
+        from papermill.clientwrap import PapermillNotebookClient
+        from papermill.engines import NBClientEngine, papermill_engines
+        from papermill.log import logger
+        from papermill.utils import merge_kwargs, remove_args
+
+        class _PooledKernelEngine(NBClientEngine):
+            @classmethod
+            def execute_managed_notebook(cls, nb_man, kernel_name, log_output=False,
+                                         stdout_file=None, stderr_file=None,
+                                         start_timeout=60, execution_timeout=None, **kwargs):
+                # same argument handling as NBClientEngine, keeping hold of the client
+                kwargs = remove_args(['input_path'], **kwargs)
+                safe_kwargs = remove_args(['timeout', 'startup_timeout'], **kwargs)
+                client = PapermillNotebookClient(nb_man, **merge_kwargs(
+                    safe_kwargs,
+                    timeout=execution_timeout if execution_timeout else kwargs.get('timeout'),
+                    startup_timeout=start_timeout,
+                    kernel_name=kernel_name,
+                    log=logger,
+                    log_output=log_output,
+                    stdout_file=stdout_file,
+                    stderr_file=stderr_file,
+                ))
+                try:
+                    return client.execute()
+                finally:
+                    if client.kc is not None:
+                        client.kc.stop_channels()
+
+        papermill_engines.register(_PM_ENGINE, _PooledKernelEngine)
+        _pm_engine_registered = True
+
+def run_papermill(input_nb, output_nb, parameters=None):
+    """
+    Execute one notebook in this interpreter via papermill's Python API, on a warm kernel
+    from the pool so kernel startup and library imports are paid once per session.
+    Output is streamed through the papermill logger handler above. Returns True on success.
+    """
+    # papermill/jupyter_client/nbformat are imported on first use (~0.4 s), so the window
+    # comes up without waiting for them; this always runs on a worker thread
+    import papermill as pm
+    from papermill.exceptions import PapermillExecutionError
+    _register_pm_engine()
+    try:
+        km = _acquire_kernel()
+    except Exception as e:
+        log(f"Failed to start kernel for {os.path.basename(input_nb)}: {e}")
+        return False
+    try:
+        pm.execute_notebook(
+            input_nb,
+            output_nb,
+            parameters=parameters or {},
+            kernel_name=KERNEL_NAME,
+            progress_bar=False,
+            log_output=True,
+            # write the output notebook once at the end, not after every cell / 30 s
+            request_save_on_cell_execute=False,
+            autosave_cell_every=0,
+            km=km,              # forwarded by papermill to its nbclient NotebookClient
+            engine_name=_PM_ENGINE,
+        )
+        return True
+    except PapermillExecutionError as e:
+        log(str(e))
+    except Exception as e:
+        log(f"Failed to execute {os.path.basename(input_nb)}: {e}")
+    finally:
+        _release_kernel(km)
+    return False
+
+def _nb_cache_key(path, parameters=None, extra_paths=()):
+    """
+    SHA-256 of the notebook's cell sources (outputs/execution counts ignored), the injected
+    parameters, the kernel name and the mtime of every input data file the notebook depends on.
+    """
+    import nbformat
+    nb = nbformat.read(path, as_version=4)
+    h = hashlib.sha256()
+    for cell in nb.cells:
+        h.update(cell.cell_type.encode())
+        h.update(cell.source.encode())
+        h.update(b"\0")
+    h.update(json.dumps(parameters or {}, sort_keys=True, default=str).encode())
+    h.update(KERNEL_NAME.encode())
+    for p in extra_paths:
+        try:
+            h.update(f"{p}:{os.stat(p).st_mtime_ns}".encode())
+        except OSError:
+            h.update(f"{p}:missing".encode())
+    return h.hexdigest()[:16]
+
+def _nb_cache_gc(cache_dir, stem):
+    """Keep only the NB_CACHE_KEEP most recently used cache entries for one source notebook."""
+    prefix = stem + "."
+    entries = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir)
+               if f.startswith(prefix) and f.endswith(".ipynb")]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for old in entries[NB_CACHE_KEEP:]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+def run_notebook_cached(input_nb, output_nb, parameters=None, extra_paths=()):
+    """
+    Like run_papermill, but skip execution when an executed copy for the same source,
+    parameters and input data already sits in the .nbcache directory next to the notebook.
+    """
+    stem = os.path.splitext(os.path.basename(input_nb))[0]
+    cache_dir = os.path.join(os.path.dirname(input_nb), NB_CACHE_DIR)
+    try:
+        key = _nb_cache_key(input_nb, parameters, extra_paths)
+    except Exception as e:
+        log(f"Notebook cache disabled for {stem}: {e}")
+        return run_papermill(input_nb, output_nb, parameters)
+
+    cached = os.path.join(cache_dir, f"{stem}.{key}.ipynb")
+    if os.path.exists(cached):
+        shutil.copyfile(cached, output_nb)
+        os.utime(cached)  # mark as recently used for GC
+        log(f"Using cached execution of {stem}")
+        return True
+
+    ok = run_papermill(input_nb, output_nb, parameters)
+    if ok:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            shutil.copyfile(output_nb, cached)
+            _nb_cache_gc(cache_dir, stem)
+        except OSError as e:
+            log(f"Could not cache {stem}: {e}")
+    return ok
 
 # --------------------------
 # FFT plotting (worker -> main thread)
 # --------------------------
-def _render_fft_plots_on_main_thread(png_bytes_list):
-    """Given a list of PNG bytes, render them as PhotoImage and add to scrollable frame."""
-    global fft_img_tks, fft_img_labels
-    # Clear prior labels & images
-    for lbl in fft_img_labels:
+def _clear_fft_images():
+    """Blank the FFT canvas's image items and drop their PhotoImages (main thread only)."""
+    for item in fft_img_items:
         try:
-            lbl.config(image="")
-            lbl.destroy()
+            fft_canvas.itemconfigure(item, image="", state="hidden")
         except Exception:
             pass
-    fft_img_labels.clear()
     fft_img_tks.clear()
 
-    for png in png_bytes_list:
+# PhotoImages of recently shown plots, keyed by (plot cache key, display width), so showing
+# the same arrays again skips the copy into Tk. Main thread only.
+_fft_photo_cache = OrderedDict()
+FFT_PHOTO_CACHE_MAX = 2 * MAX_FFT_IMAGES
+
+def _fit_fft_width(key, img, width):
+    """
+    Worker side: shrink a plot wider than the FFT tab (a narrow window gets narrower
+    PhotoImages; Tk keeps them as 32-bit pixels). Returns (PhotoImage cache key, image).
+    """
+    if width > 1 and img.width > width:
+        img = img.resize((width, max(1, img.height * width // img.width)), Image.Resampling.BILINEAR)
+    return (key, img.width), img
+
+def _render_fft_plots_on_main_thread(images):
+    """
+    Given a list of (cache key, PIL image), stack them as PhotoImages on fft_canvas. Existing
+    image items are moved and re-pointed rather than recreated, so there is no widget
+    teardown or geometry-manager pass per plot.
+    """
+    # Drop references to the previous set; no idle flush here, since progressive delivery
+    # re-lays out the same items and would flicker. Evicted PhotoImages are freed by Tk.
+    _clear_fft_images()
+
+    y, width, n = FFT_IMG_PAD, 0, 0
+    for pkey, img in images:
         try:
-            img = Image.open(BytesIO(png))
-            img_tk = ImageTk.PhotoImage(img)
-            fft_img_tks.append(img_tk)  # keep reference (very important)
-            lbl = tk.Label(fft_scrollable_frame, image=img_tk)
-            lbl.pack(pady=5)
-            fft_img_labels.append(lbl)
+            img_tk = _fft_photo_cache.get(pkey)
+            if img_tk is None:
+                img_tk = ImageTk.PhotoImage(img)
+                _fft_photo_cache[pkey] = img_tk
+                while len(_fft_photo_cache) > FFT_PHOTO_CACHE_MAX:
+                    _fft_photo_cache.popitem(last=False)
+            else:
+                _fft_photo_cache.move_to_end(pkey)
         except Exception as e:
             log(f"Error creating Tk image: {e}")
+            continue
+        fft_img_tks.append(img_tk)  # keep reference (very important)
+        if n < len(fft_img_items):
+            fft_canvas.coords(fft_img_items[n], FFT_IMG_PAD, y)
+            fft_canvas.itemconfigure(fft_img_items[n], image=img_tk, state="normal")
+        else:
+            fft_img_items.append(fft_canvas.create_image(FFT_IMG_PAD, y, anchor="nw", image=img_tk))
+        n += 1
+        y += img_tk.height() + 2 * FFT_IMG_PAD
+        width = max(width, img_tk.width())
+
+    # drop items left over from a longer previous set
+    for item in fft_img_items[n:]:
+        fft_canvas.delete(item)
+    del fft_img_items[n:]
+    fft_canvas.configure(scrollregion=(0, 0, width + 2 * FFT_IMG_PAD, y))
+
+def _minmax_decimate(x, y, n_buckets):
+    """
+    Reduce (x, y) to 2*n_buckets points by keeping the min and max of y in each bucket of
+    consecutive samples, so peaks survive. Short arrays are returned unchanged.
+    """
+    if len(y) <= 4 * n_buckets:
+        return x, y
+    starts = np.linspace(0, len(y), n_buckets, endpoint=False).astype(np.intp)
+    y = np.asarray(y)
+    lo = np.minimum.reduceat(y, starts)
+    hi = np.maximum.reduceat(y, starts)
+    return np.repeat(np.asarray(x)[starts], 2), np.column_stack((lo, hi)).ravel()
+
+# Rendered plots kept in memory, keyed by (npy path, mtime_ns, size); oldest evicted first
+_fft_img_cache = OrderedDict()
+FFT_IMG_CACHE_MAX = 32
+
+# Cached plot PNGs: <data dir>/.fftcache/<npy stem>.<npy mtime_ns>.r<version>.<w>x<h>.png.
+# Everything in that directory belongs to the cache, so GC and "Clear cache" never touch the
+# user's own files.
+FFT_PNG_CACHE_DIR = ".fftcache"
+FFT_PNG_CACHE_KEEP = 20         # cached plot PNGs kept per data directory
+FFT_RENDER_VERSION = 1          # bump whenever _render_fft_pil's output changes
+
+def _fft_png_cache_path(npy_path):
+    """
+    Cached plot for an array. The array's mtime, the renderer version and the plot size are
+    all in the name, so a change to any of them makes a fresh render instead of a reuse.
+    """
+    d, name = os.path.split(npy_path)
+    stem = os.path.splitext(name)[0]
+    w, h = FFT_PLOT_SIZE
+    return os.path.join(d, FFT_PNG_CACHE_DIR,
+                        f"{stem}.{os.stat(npy_path).st_mtime_ns}.r{FFT_RENDER_VERSION}.{w}x{h}.png")
+
+def _fft_png_cache_gc(npy_paths):
+    """Keep only the FFT_PNG_CACHE_KEEP newest cached plots in each data directory."""
+    for d in {os.path.join(os.path.dirname(p), FFT_PNG_CACHE_DIR) for p in npy_paths}:
+        try:
+            cached = [os.path.join(d, f) for f in os.listdir(d) if f.endswith(".png")]
+        except OSError:
+            continue
+        cached.sort(key=os.path.getmtime, reverse=True)
+        for old in cached[FFT_PNG_CACHE_KEEP:]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+FFT_PLOT_SIZE = (800, 300)                # px, same footprint as the old 8x3in @100dpi figure
+_FFT_MARGINS = (80, 26, 12, 40)           # left, top, right, bottom
+_FFT_LINE_COLOR = (31, 119, 180)
+_FFT_GRID_COLOR = (225, 225, 225)
+_FFT_GRID_DIVS = 5
+
+@lru_cache(maxsize=1)
+def _fft_font():
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=4)
+def _fft_background(size):
+    """
+    Static part of every FFT plot (grid, frame, axis labels), drawn once per size.
+    Callers .copy() it, like reusing one figure and only swapping the line data.
+    """
+    w, h = size
+    left, top, right, bottom = _FFT_MARGINS
+    pw, ph = w - left - right, h - top - bottom
+    font = _fft_font()
+    img = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(img)
+    for i in range(1, _FFT_GRID_DIVS):
+        gx = left + i * pw // _FFT_GRID_DIVS
+        gy = top + i * ph // _FFT_GRID_DIVS
+        draw.line((gx, top, gx, top + ph), fill=_FFT_GRID_COLOR)
+        draw.line((left, gy, left + pw, gy), fill=_FFT_GRID_COLOR)
+    draw.rectangle((left, top, left + pw, top + ph), outline="black")
+    draw.text((left + pw // 2, h - 4), "Frequency (Hz)", fill="black", font=font, anchor="ms")
+    ylabel = Image.new("RGB", (ph, 14), "white")
+    ImageDraw.Draw(ylabel).text((ph // 2, 7), "Magnitude", fill="black", font=font, anchor="mm")
+    img.paste(ylabel.rotate(90, expand=True), (2, top))
+    return img
+
+def _render_fft_pil(freq, mag, title, size=FFT_PLOT_SIZE):
+    """
+    Rasterise one magnitude spectrum straight into a PIL image: a copy of the cached
+    background plus min/max tick labels, title and a single polyline. Far cheaper than
+    matplotlib's Axes layout for a fixed-size, non-interactive preview.
+    """
+    w, h = size
+    left, top, right, bottom = _FFT_MARGINS
+    pw, ph = w - left - right, h - top - bottom
+    font = _fft_font()
+    img = _fft_background(size).copy()
+    draw = ImageDraw.Draw(img)
+
+    # data -> pixel coordinates (x follows the frequency values, as ax.plot did)
+    fmin, fmax = float(np.nanmin(freq)), float(np.nanmax(freq))
+    mmin, mmax = float(np.nanmin(mag)), float(np.nanmax(mag))
+    fspan = (fmax - fmin) or 1.0
+    mspan = (mmax - mmin) or 1.0
+    x = left + (np.asarray(freq, dtype=np.float64) - fmin) * ((pw - 1) / fspan)
+    y = top + ph - 1 - (np.asarray(mag, dtype=np.float64) - mmin) * ((ph - 1) / mspan)
+    if len(x) > 1:
+        draw.line(np.column_stack((x, y)).ravel().tolist(), fill=_FFT_LINE_COLOR, width=1)
+
+    # tick labels at the axis extremes and title
+    draw.text((left, top + ph + 4), f"{fmin:.4g}", fill="black", font=font)
+    draw.text((left + pw, top + ph + 4), f"{fmax:.4g}", fill="black", font=font, anchor="ra")
+    draw.text((left - 4, top + ph), f"{mmin:.4g}", fill="black", font=font, anchor="rs")
+    draw.text((left - 4, top), f"{mmax:.4g}", fill="black", font=font, anchor="ra")
+    draw.text((w // 2, top // 2), title, fill="black", font=font, anchor="mm")
+    return img
+
+def _load_or_render_fft(path):
+    """Load the array's cached PNG, or render it with Pillow and write that PNG."""
+    cache_path = _fft_png_cache_path(path)
+    if os.path.exists(cache_path):
+        with Image.open(cache_path) as cached:
+            return cached.copy()
+    arr = np.load(path, mmap_mode="r")
+    # Expect arr shape like (N, 4) or (N, >=2)
+    # more line segments than pixel columns is wasted raster work
+    plot_w = FFT_PLOT_SIZE[0] - _FFT_MARGINS[0] - _FFT_MARGINS[2]
+    freq, mag = _minmax_decimate(arr[:, 0], arr[:, 1], plot_w)
+    # own copies of just the plotted columns, so nothing keeps the mmap alive
+    freq, mag = np.array(freq), np.array(mag)
+    del arr
+    img = _render_fft_pil(freq, mag, os.path.basename(path))
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        img.save(cache_path)
+    except OSError as e:
+        log(f"Could not cache plot for {os.path.basename(path)}: {e}")
+    return img
+
+def _render_fft_one(path):
+    """
+    (cache key, PIL image) for one FFT array: from the in-memory cache while the file's
+    (mtime, size) is unchanged, otherwise from _load_or_render_fft. None on failure.
+    """
+    if app_closing.is_set():
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        log(f"FFT numpy file not found: {path}")
+        return None
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    with lock:
+        img = _fft_img_cache.get(key)
+        if img is not None:
+            _fft_img_cache.move_to_end(key)
+            return key, img
+    try:
+        img = _load_or_render_fft(path)
+    except Exception as e:
+        log(f"Error plotting {path}: {e}")
+        return None
+    with lock:
+        _fft_img_cache[key] = img
+        while len(_fft_img_cache) > FFT_IMG_CACHE_MAX:
+            _fft_img_cache.popitem(last=False)
+    return key, img
 
 def plot_fft_from_numpy(npy_paths):
-    """Render matplotlib figures (to PNG) in a worker thread and deliver to main thread."""
+    """
+    Render FFT plots in worker threads and deliver them to the main thread as PIL images.
+    Files are rendered concurrently (np.load and Pillow's drawing release the GIL) and shown
+    progressively, in order. Each plot is also written once as a PNG in the .fftcache directory
+    next to its array and loaded from there while the array is unchanged.
+    """
+    paths = list(npy_paths)
+    if len(paths) > MAX_FFT_IMAGES:
+        log(f"Showing the first {MAX_FFT_IMAGES} of {len(paths)} FFT plots")
+        paths = paths[:MAX_FFT_IMAGES]
+
+    def _prepare(path, width):
+        r = _render_fft_one(path)
+        return None if r is None else _fit_fft_width(*r, width)
+
     def worker():
-        if app_closing:
+        if app_closing.is_set():
             return
+        _fft_png_cache_gc(paths)
+        width = fft_view_width      # read once, so every plot of this batch gets the same size
+        # at least two threads, so one file's read overlaps another's drawing even on one core
+        n_threads = max(1, min(len(paths), max(2, os.cpu_count() or 1)))
         rendered = []
-        for path in npy_paths:
-            if app_closing:
-                return
-            if not os.path.exists(path):
-                log(f"FFT numpy file not found: {path}")
-                continue
-            try:
-                arr = np.load(path)
-                # Expect arr shape like (N, 4) or (N, >=2)
-                freq = arr[:, 0]
-                mag  = arr[:, 1]
-                fig, ax = plt.subplots(figsize=(8, 3))
-                ax.plot(freq, mag)
-                ax.set_title(os.path.basename(path))
-                ax.set_xlabel("Frequency (Hz)")
-                ax.set_ylabel("Magnitude")
-                ax.grid(True)
-                buf = BytesIO()
-                fig.savefig(buf, format="png", bbox_inches="tight")
-                plt.close(fig)
-                buf.seek(0)
-                rendered.append(buf.getvalue())
-            except Exception as e:
-                log(f"Error plotting {path}: {e}")
-        if not app_closing:
-            root.after(0, lambda: _render_fft_plots_on_main_thread(rendered))
-
-    # clear current UI first
-    root.after(0, lambda: [w.destroy() for w in fft_scrollable_frame.winfo_children()])
+        with ThreadPoolExecutor(max_workers=n_threads) as ex:
+            # map yields in order as results complete: show each plot as soon as it and the
+            # ones above it are ready, instead of after the slowest file
+            for r in ex.map(_prepare, paths, [width] * len(paths)):
+                if app_closing.is_set():
+                    return
+                if r is None:
+                    continue
+                rendered.append(r)
+                shown = list(rendered)
+                root.after(0, lambda shown=shown: _render_fft_plots_on_main_thread(shown))
+
+    # clear current UI (and release its PhotoImages) before the new plots are rendered
+    root.after(0, _clear_fft_images)
     start_worker(worker)
 
 # --------------------------
 # Notebook output display logic
 # --------------------------
-def show_notebook_output_in_tab(original_nb_path):
+def _join_nb_text(value):
+    """Notebook JSON stores multi-line strings as lists of lines; join them back."""
+    if isinstance(value, list):
+        return "".join(value)
+    return value or ""
+
+def _collect_notebook_outputs(executed_path):
+    """Concatenate the sources/outputs of every cell tagged 'log_cm' into display text."""
+    # Read executed notebook as plain JSON: only tags, sources and text outputs are
+    # needed, so skip nbformat's validation and never touch image payloads
+    try:
+        with open(executed_path, "rb") as f:
+            raw = f.read()
+        nb = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except ValueError:
+        nb = None           # not valid JSON
+    # pre-v4 notebooks parse fine but keep cells under worksheets: let nbformat upgrade them
+    if not isinstance(nb, dict) or nb.get("nbformat", 0) < 4 or "cells" not in nb:
+        import nbformat
+        nb = nbformat.read(executed_path, as_version=4)
+    # only cells tagged 'log_cm' are shown; keep their original index for the header
+    tagged = [(idx, cell) for idx, cell in enumerate(nb.get("cells", []))
+              if 'log_cm' in cell.get('metadata', {}).get('tags', ())]
+    buf = io.StringIO()
+    for idx, cell in tagged:
+        cell_type = cell.get("cell_type", "")
+        buf.write(f"--- Cell {idx} ({cell_type}) ---\n")
+        if cell_type == "markdown":
+            buf.write(_join_nb_text(cell.get("source")) + "\n")
+        elif cell_type == "code":
+            outputs = cell.get("outputs", [])
+            if not outputs:
+                buf.write("[no outputs]\n")
+            else:
+                for out in outputs:
+                    otype = out.get("output_type", "")
+                    if otype == "stream":
+                        buf.write(_join_nb_text(out.get("text")) + "\n")
+                    elif otype in ("execute_result", "display_data"):
+                        data = out.get("data", {})
+                        text = _join_nb_text(data.get("text/plain"))
+                        if text:
+                            buf.write(text + "\n")
+                    elif otype == "error":
+                        tb = out.get("traceback", [])
+                        if tb:
+                            buf.write("\n".join(tb))
+                            buf.write("\n")
+    buf.write("\n")
+    return buf.getvalue()
+
+def show_notebook_output_in_tab(original_nb_path, input_paths=()):
     """
     Ensure cm_output_box (ScrolledText) exists, then:
     - prefer to read the executed notebook (executed_<name>.ipynb) if present already
     - otherwise execute the original notebook via papermill to create executed_<name>.ipynb
+      (served from the .nbcache directory when the source and input_paths are unchanged)
     - parse the executed notebook and display every cell's outputs into the cm_output_box
     This function is safe to call from worker threads; UI modifications are marshalled to main thread.
     """
-    global cm_output_box
-
-    # Create the cm_output_box on main thread synchronously (we schedule and wait briefly)
-    created = threading.Event()
+    # Create the cm_output_box on the main thread (once; later calls reuse it); the worker is
+    # started from there, so it never runs before the box exists and this returns immediately.
     def _create_box():
-        global cm_output_box
-        # Clear existing
-        for w in cm_tab.winfo_children():
-            try:
-                w.destroy()
-            except Exception:
-                pass
-        cm_output_box = scrolledtext.ScrolledText(cm_tab, width=120, height=35)
-        cm_output_box.pack(padx=10, pady=10, fill="both", expand=True)
-        created.set()
-    root.after(0, _create_box)
-    # Wait until box created (safe short sleep loop)
-    for _ in range(200):  # up to ~2 seconds
-        if created.wait(timeout=0.01):
-            break
+        global cm_output_box, cm_shown_key
+        if cm_output_box is None or not cm_output_box.winfo_exists():
+            for w in cm_tab.winfo_children():
+                try:
+                    w.destroy()
+                except Exception:
+                    pass
+            cm_output_box = scrolledtext.ScrolledText(cm_tab, width=120, height=35)
+            cm_output_box.pack(padx=10, pady=10, fill="both", expand=True)
+            cm_shown_key = None
+        start_worker(worker)
+
+    def _show_message(text):
+        # replaces whatever the reused box showed, so the next output is inserted afresh
+        global cm_shown_key
+        if cm_output_box and cm_output_box.winfo_exists():
+            cm_output_box.delete("1.0", tk.END)
+            cm_output_box.insert("1.0", text)
+            cm_shown_key = None
 
     def worker():
         try:
-            if app_closing:
+            if app_closing.is_set():
                 return
             # determine executed notebook path
             dirname = os.path.dirname(original_nb_path)
@@ -194,132 +841,112 @@ def show_notebook_output_in_tab(original_nb_path):
 
             # If executed exists already, read it; otherwise, run papermill to create it
             if not os.path.exists(executed_path):
-                # run papermill (subprocess) and stream logs into output_box
-                cmd = [sys.executable, "-m", "papermill", original_nb_path, executed_path]
-                try:
-                    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-                    register_process(proc)
-                except FileNotFoundError as e:
-                    log(f"Failed to start papermill: {e}")
-                    return
-
-                # stream output lines
-                for line in proc.stdout:
-                    if app_closing:
-                        try:
-                            proc.terminate()
-                        except Exception:
-                            pass
-                        break
-                    log(line.rstrip("\n"))
-                proc.wait()
-                unregister_process(proc)
-                if proc.returncode != 0:
-                    log(f"papermill returned code {proc.returncode}")
-                    # still attempt to read file if it exists
+                # a failed run still leaves a partially executed notebook worth reading
+                run_notebook_cached(original_nb_path, executed_path, extra_paths=input_paths)
             else:
                 log(f"Found existing executed notebook: {executed_path}")
 
-            if app_closing:
+            if app_closing.is_set():
                 return
             if not os.path.exists(executed_path):
-                root.after(0, lambda: cm_output_box.insert("1.0", f"Executed notebook not found: {executed_path}\n"))
+                root.after(0, lambda: _show_message(f"Executed notebook not found: {executed_path}\n"))
                 return
 
-            # Read executed notebook and collect outputs
-            nb = nbformat.read(executed_path, as_version=4)
-            all_text_lines = []
-            for idx, cell in enumerate(nb.cells):
-                # Skip non-important cells
-                tags = cell.get('metadata', {}).get('tags', [])
-                if 'log_cm' not in tags:
-                    continue  # skip cell if not tagged
-
-                all_text_lines.append(f"--- Cell {idx} ({cell.cell_type}) ---\n")
-                if cell.cell_type == "markdown":
-                    all_text_lines.append(cell.source + "\n")
-                elif cell.cell_type == "code":
-                    outputs = cell.get("outputs", [])
-                if not outputs:
-                    all_text_lines.append("[no outputs]\n")
-                else:
-                    for out in outputs:
-                        otype = out.get("output_type", "")
-                        if otype == "stream":
-                            all_text_lines.append(out.get("text", "") + "\n")
-                        elif otype in ("execute_result", "display_data"):
-                            data = out.get("data", {})
-                            text = data.get("text/plain")
-                            if text:
-                                all_text_lines.append(str(text) + "\n")
-                        elif otype == "error":
-                            tb = out.get("traceback", [])
-                            if tb:
-                                all_text_lines.append("\n".join(tb) + "\n")
-            all_text_lines.append("\n")
-            all_text = "".join(all_text_lines)
+            # Reuse the text rendered for this exact file version, if any
+            st = os.stat(executed_path)
+            key = (executed_path, st.st_mtime_ns, st.st_size)
+            with lock:
+                all_text = _nb_text_cache.get(key)
+                if all_text is not None:
+                    _nb_text_cache.move_to_end(key)
+            if all_text is None:
+                all_text = _collect_notebook_outputs(executed_path)
+                with lock:
+                    _nb_text_cache[key] = all_text
+                    while len(_nb_text_cache) > NB_TEXT_CACHE_MAX:
+                        _nb_text_cache.popitem(last=False)
+
+            # Tk text scrolling degrades with line count, so very long outputs show their tail
+            if len(all_text) > CM_TEXT_MAX_CHARS:
+                cut = len(all_text) - CM_TEXT_MAX_CHARS
+                cut = all_text.find("\n", cut) + 1 or cut     # start on a line boundary
+                all_text = (f"[truncated: first {cut} characters omitted]\n"
+                            + all_text[cut:])
 
             # Insert into cm_output_box on main thread
             def _insert():
+                global cm_shown_key
                 if cm_output_box and cm_output_box.winfo_exists():
+                    # same file version still on screen (not cleared by a task start): keep it
+                    if key == cm_shown_key and cm_output_box.compare("end-1c", "!=", "1.0"):
+                        return
                     try:
+                        # detach the scrollbar so it is updated once, not during the insert
+                        cm_output_box.configure(yscrollcommand="")
                         cm_output_box.delete("1.0", tk.END)
                         cm_output_box.insert("1.0", all_text)
+                        cm_output_box.configure(yscrollcommand=cm_output_box.vbar.set)
                         cm_output_box.see(tk.END)
+                        cm_shown_key = key
                     except Exception:
                         pass
             root.after(0, _insert)
 
         except Exception as e:
-            def _err():
-                if cm_output_box and cm_output_box.winfo_exists():
-                    cm_output_box.insert("1.0", f"Error while producing notebook output: {e}\n")
-            root.after(0, _err)
+            msg = f"Error while producing notebook output: {e}\n"
+            root.after(0, lambda: _show_message(msg))
 
-    start_worker(worker)
+    root.after(0, _create_box)
 
 # --------------------------
 # Execute notebooks helper (used for conversion/training)
 # --------------------------
-def execute_notebooks(notebooks_path, notebooks_list, parameters=None):
+def run_notebook_jobs(jobs):
     """
-    Execute a list of notebooks using papermill via subprocess, stream output to output_box/log.
-    Can inject parameters (dict) into the notebooks.
+    Execute resolved _nb_job tuples (see TASK_JOBS) in-process using papermill, streaming
+    output to output_box/log; each job carries the parameters injected into its notebook.
+    Always executes: these notebooks are run for their side effects (processed arrays,
+    saved models), which a cached copy would skip. Independent notebooks run concurrently
+    (each in its own kernel); their log lines are prefixed with the notebook name.
+    Cancellation (app_closing) is checked before each one. Returns True if every notebook
+    ran successfully.
     """
-    parameters = parameters or {}
-    for nb in notebooks_list:
-        if app_closing:
-            return
-        input_nb = os.path.join(notebooks_path, nb)
-        output_nb = os.path.join(notebooks_path, "executed_" + nb)
-        log(f"Running notebook: {nb} ...")
+    concurrent = len(jobs) > 1
 
-        # Build papermill command
-        cmd = [sys.executable, "-m", "papermill", input_nb, output_nb]
-        for k, v in parameters.items():
-            cmd += ["-p", str(k), str(v)]
+    def _run_one(job):
+        nb, nb_params, input_nb, output_nb = job
+        if app_closing.is_set():
+            return False
+        log(f"Running notebook: {nb} ...")
 
+        _log_context.prefix = f"[{nb}] " if concurrent else ""
         try:
-            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-            register_process(proc)
-        except FileNotFoundError as e:
-            log(f"Failed to start papermill for {nb}: {e}")
-            continue
-
-        for line in proc.stdout:
-            if app_closing:
-                try:
-                    proc.terminate()
-                except Exception:
-                    pass
-                break
-            log(line.rstrip("\n"))
-        proc.wait()
-        unregister_process(proc)
-        if proc.returncode == 0:
+            ok = run_papermill(str(input_nb), str(output_nb), nb_params)
+        finally:
+            _log_context.prefix = ""
+        if ok:
             log(f"Finished notebook: {nb}")
         else:
-            log(f"Error running {nb}, return code: {proc.returncode}")
+            log(f"Error running {nb}")
+        return ok
+
+    if not concurrent:
+        return all([_run_one(job) for job in jobs])
+    with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+        return all(list(ex.map(_run_one, jobs)))
+
+
+def clear_caches():
+    """Delete cached notebook executions and FFT plot PNGs, and drop the in-memory caches."""
+    for d in (PATHS.conv_dir, PATHS.train_dir):
+        shutil.rmtree(d / NB_CACHE_DIR, ignore_errors=True)
+    with lock:
+        _nb_text_cache.clear()
+        _fft_img_cache.clear()
+        task_done.clear()
+    _fft_photo_cache.clear()    # Tk thread: menu callback
+    shutil.rmtree(PATHS.processed_dir / FFT_PNG_CACHE_DIR, ignore_errors=True)
+    main_status.set("Caches cleared")
 
 
 # --------------------------
@@ -328,83 +955,136 @@ def execute_notebooks(notebooks_path, notebooks_list, parameters=None):
 # --------------------------
 # Task pipeline (background worker)
 # --------------------------
-def run_task_pipeline(task):
-    if app_closing:
-        return
+ADC_TO_FFT_PY = Path(__file__).resolve().parent / "source_code" / "adc_to_fft.py"
 
-    # 1) ADC -> FFT conversion notebooks with per-notebook label info
-    conversion_notebooks_path = "/Users/mandarkale/Documents/MyProjects/MachineLearning/FIUS_Based_Infant_Presence_Detection_in_Car_Seats/source_code/Notebooks/Exploration"
-
-    conversion_map = {
-        "Task1": [
-            {"notebook": "ADC to FFT Emptyseat.ipynb", "label_column_name": "Object_Presence", "label_value": 0},
-            {"notebook": "ADC to FFT Carrierseat.ipynb", "label_column_name": "Object_Presence", "label_value": 1},
-        ],
-        "Task2": [
-            {"notebook": "ADC to FFT Carrierseat.ipynb", "label_column_name": "Infant_Presence", "label_value": 0},
-            {"notebook": "ADC to FFT Withbaby.ipynb", "label_column_name": "Infant_Presence", "label_value": 1},
-        ],
-        "Task3": [
-            {"notebook": "ADC to FFT Blanket and Sunscreen.ipynb", "label_column_name": "Infant_Presence", "label_value": 1},
-        ],
-    }
-
-    conv_list = conversion_map.get(task, [])
-    for nb_info in conv_list:
-        execute_notebooks(
-            conversion_notebooks_path,
-            [nb_info["notebook"]],
-            parameters={
-                "label_column_name": nb_info["label_column_name"],
-                "label_value": nb_info["label_value"]
-            }
-        )
+@lru_cache(maxsize=1)
+def _load_adc_to_fft():
+    """Import source_code/adc_to_fft.py by path (source_code is not a package)."""
+    spec = importlib.util.spec_from_file_location("adc_to_fft", ADC_TO_FFT_PY)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)     # scipy/pandas are only needed from here on
+    return module
 
-    log("ADC -> FFT conversion finished ✅")
+def _convert_adc(nb_info):
+    """
+    Run one conversion-notebook entry directly with source_code/adc_to_fft.py. Returns True on
+    success (or when the output is already newer than every raw CSV), False on error and
+    None when its raw folder or the module (with scipy/pandas) is not available, so the
+    caller runs the notebook instead.
+    """
+    source = ADC_SOURCES.get(nb_info["notebook"])
+    if source is None or app_closing.is_set():
+        return None
+    raw_dir = PATHS.raw_dir / source[0]
+    out_path = PATHS.processed_dir / source[1].format(**nb_info)
+    try:
+        csv_mtimes = [e.stat().st_mtime for e in os.scandir(raw_dir) if e.name.endswith(".csv")]
+    except OSError:
+        return None
+    if not csv_mtimes:
+        return None
+    try:
+        if os.stat(out_path).st_mtime >= max(csv_mtimes):
+            log(f"{out_path.name} is up to date")
+            return True
+    except OSError:
+        pass
+    try:
+        adc_to_fft = _load_adc_to_fft()
+    except Exception as e:     # missing module or its scipy/pandas imports
+        log(f"Cannot load {ADC_TO_FFT_PY.name} ({e}); running {nb_info['notebook']} instead")
+        return None
+    log(f"Converting {raw_dir.name} -> {out_path.name} ...")
+    try:
+        adc_to_fft.convert(raw_dir, out_path, nb_info["label_value"])
+    except Exception as e:
+        log(f"Error converting {raw_dir.name}: {e}")
+        return False
+    log(f"Saved {out_path.name}")
+    return True
+
+def _task_inputs_mtime(task, processed):
+    """
+    Newest mtime among a task's notebooks, its raw ADC CSVs, the ADC -> FFT module, its
+    executed training output and the processed arrays.
+    """
+    jobs = TASK_JOBS[task]
+    paths = [in_path for _, _, in_path, _ in jobs.conversion] + [ADC_TO_FFT_PY]
+    for info in CONVERSION_MAP.get(task, []):
+        source = ADC_SOURCES.get(info["notebook"])
+        try:
+            # a missing raw folder is fine: that entry runs its notebook, not adc_to_fft
+            paths += [e.path for e in os.scandir(PATHS.raw_dir / source[0]) if e.name.endswith(".csv")]
+        except (OSError, TypeError):
+            pass
+    for _, _, in_path, out_path in jobs.training:
+        paths += [in_path, out_path]
+    paths += [p for name, p in processed.items() if name.endswith(".npy")]
+    try:
+        return max((os.stat(p).st_mtime for p in paths), default=0.0)
+    except OSError:
+        return float("inf")     # something is missing: run the task for real
 
-    # 2) plot FFTs (from npy)
-    fft_base_path = "/Users/mandarkale/Documents/MyProjects/MachineLearning/FIUS_Based_Infant_Presence_Detection_in_Car_Seats/source_code/Data/Processed"
-
-    # Define numpy arrays for each task
-    task_fft_files = {
-        "Task1": [
-            os.path.join(fft_base_path, "Emptyseat_npy_array_Lowpassfiltered_label.npy"),
-            os.path.join(fft_base_path, "CarrierSeat_Lowpassfiltered_Label_0_Infant_Presence.npy")
-        ],
-        "Task2": [
-            os.path.join(fft_base_path, "CarrierSeat_Lowpassfiltered_Label_0_Infant_Presence.npy"),
-            os.path.join(fft_base_path, "Withbaby_npy_array_Lowpassfiltered.npy")
-        ],
-        "Task3": [
-            os.path.join(fft_base_path, "Blanket_and_Sunscreen_npy_array_Lowpassfiltered_Label_1.npy")
-        ]
-    }
-
-    # Only include files that actually exist
-    fft_npy_paths = [path for path in task_fft_files.get(task, []) if os.path.exists(path)]
+def _scan_processed():
+    # one directory scan answers every "does this array exist?" question
+    try:
+        return {e.name: Path(e.path) for e in os.scandir(PATHS.processed_dir) if e.is_file()}
+    except OSError:
+        return {}
 
+def _show_fft_plots(task, processed):
+    # only include files that actually exist
+    fft_npy_paths = [p for p in TASK_FFT_FILES.get(task, ()) if p.name in processed]
     if fft_npy_paths:
         plot_fft_from_numpy(fft_npy_paths)
     else:
         log(f"No FFT numpy files found for {task}.")
 
+def _show_training_output(task, processed):
+    # prefers executed_*.ipynb; training results depend on every processed array, so
+    # a notebook cache entry is keyed on all of them
+    training = TASK_JOBS[task].training
+    if training:
+        input_paths = [str(processed[name]) for name in sorted(processed) if name.endswith(".npy")]
+        show_notebook_output_in_tab(str(training[0][2]), input_paths)
+
+def run_task_pipeline(task):
+    if app_closing.is_set():
+        return
+
+    processed = _scan_processed()
+    if task_done.get(task, -1.0) >= _task_inputs_mtime(task, processed):
+        log("Nothing changed since the last run; using cached task results")
+        _show_fft_plots(task, processed)
+        _show_training_output(task, processed)
+        return
+
+    # 1) ADC -> FFT conversion with per-notebook label info; each entry reads its own raw
+    #    folder and writes its own array, so they run concurrently. Entries whose raw CSVs
+    #    are not available here fall back to executing the notebook.
+    conv_list = CONVERSION_MAP.get(task, [])
+    with ThreadPoolExecutor(max_workers=max(1, min(len(conv_list), os.cpu_count() or 1))) as ex:
+        direct = list(ex.map(_convert_adc, conv_list))
+    ok = all(r is not False for r in direct)
+    ok = run_notebook_jobs([job for job, r in zip(TASK_JOBS[task].conversion, direct)
+                            if r is None]) and ok
+
+    log("ADC -> FFT conversion finished ✅")
+    processed = _scan_processed()
+
+    # 2) plot FFTs (from npy)
+    _show_fft_plots(task, processed)
 
     # 3) training notebooks
-    training_notebooks_path = "/Users/mandarkale/Documents/MyProjects/MachineLearning/FIUS_Based_Infant_Presence_Detection_in_Car_Seats/source_code/Notebooks/Training"
-    training_map = {
-        "Task1": ["Task1_Empty seat or carrier seat Classification using XG Boost model and MLP model.ipynb"],
-        "Task2": ["Task2_With or without baby Detection using RanFor model and SVM model.ipynb"],
-        "Task3": ["Task3_Baby presence detection when covered in blanket or sunscreen.ipynb"]
-    }
-    train_list = training_map.get(task, [])
-    if train_list:
-        execute_notebooks(training_notebooks_path, train_list)
+    training = TASK_JOBS[task].training
+    if training:
+        ok = run_notebook_jobs(training) and ok
         log("Notebook-based model training finished ✅")
 
-    # 4) show outputs of the executed training notebook (prefer executed_*.ipynb)
-    if train_list:
-        original_nb = os.path.join(training_notebooks_path, train_list[0])
-        show_notebook_output_in_tab(original_nb)
+    # 4) show outputs of the executed training notebook
+    _show_training_output(task, processed)
+    if ok and not app_closing.is_set():
+        task_done[task] = time.time()
 
 
 # --------------------------
@@ -435,14 +1115,7 @@ def run_task_window(task_name):
         # --------------------------
         if cm_output_box and cm_output_box.winfo_exists():
             cm_output_box.delete("1.0", tk.END)
-        for lbl in fft_img_labels:
-            try:
-                lbl.config(image="")
-                lbl.destroy()
-            except Exception:
-                pass
-        fft_img_labels.clear()
-        fft_img_tks.clear()
+        _clear_fft_images()
         
         log(f"Starting {task_name}...")
         progress.config(mode="indeterminate")
@@ -490,8 +1163,11 @@ def run_task_window(task_name):
 # --------------------------
 def on_close():
     """Attempt graceful shutdown: stop processes, join threads, clear images, then destroy root."""
-    global app_closing
-    app_closing = True
+    app_closing.set()
+
+    # Kill pooled notebook kernels first: a cell still executing on one fails right away
+    # (nbclient sees the dead kernel) instead of running on while we wait for processes.
+    shutdown_kernels()
 
     with lock:
         procs = list(spawned_processes)
@@ -505,31 +1181,26 @@ def on_close():
     deadline = time.time() + 3.0
     for p in procs:
         try:
-            while p.poll() is None and time.time() < deadline:
-                time.sleep(0.05)
-            if p.poll() is None:
+            p.wait(timeout=max(0.0, deadline - time.time()))
+        except subprocess.TimeoutExpired:
+            try:
                 p.kill()
+            except Exception:
+                pass
         except Exception:
             pass
 
-    # join worker threads briefly
+    # give running workers a moment (about 1 s each, as the old per-thread joins did),
+    # and drop whatever is still queued
     with lock:
-        threads = list(worker_threads)
-    for t in threads:
-        try:
-            t.join(timeout=1.0)
-        except Exception:
-            pass
+        futures = list(worker_futures)
+    if futures:
+        wait(futures, timeout=1.0 * len(futures))
+    TASK_POOL.shutdown(wait=False, cancel_futures=True)
 
     # remove Tk images & widgets before destroying root to avoid Image.__del__ calling Tk from wrong thread
-    for lbl in fft_img_labels:
-        try:
-            lbl.config(image="")
-            lbl.destroy()
-        except Exception:
-            pass
-    fft_img_labels.clear()
-    fft_img_tks.clear()
+    _clear_fft_images()
+    _fft_photo_cache.clear()
 
     try:
         root.destroy()
@@ -544,6 +1215,12 @@ root.title("FIUS-Based Infant Presence Detection")
 root.geometry("1000x700")
 root.protocol("WM_DELETE_WINDOW", on_close)
 
+menubar = tk.Menu(root)
+cache_menu = tk.Menu(menubar, tearoff=0)
+cache_menu.add_command(label="Clear cache", command=clear_caches)
+menubar.add_cascade(label="Cache", menu=cache_menu)
+root.config(menu=menubar)
+
 tk.Label(root, text="FIUS-Based Infant Presence Detection",
          font=("Helvetica", 18, "bold")).pack(pady=20)
 
@@ -579,17 +1256,21 @@ cm_tab  = tk.Frame(notebook)
 # build scrollable frame for FFT images
 fft_canvas = tk.Canvas(fft_tab)
 fft_scrollbar = ttk.Scrollbar(fft_tab, orient="vertical", command=fft_canvas.yview)
-fft_scrollable_frame = tk.Frame(fft_canvas)
 
+# plots are image items drawn straight on the canvas; _render_fft_plots_on_main_thread
+# sets the scrollregion
 def _on_mousewheel(event):
     fft_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-fft_scrollable_frame.bind("<Enter>", lambda e: fft_canvas.bind_all("<MouseWheel>", _on_mousewheel))
-fft_scrollable_frame.bind("<Leave>", lambda e: fft_canvas.unbind_all("<MouseWheel>"))
-
-fft_scrollable_frame.bind("<Configure>", lambda e: fft_canvas.configure(scrollregion=fft_canvas.bbox("all")))
+fft_canvas.bind("<Enter>", lambda e: fft_canvas.bind_all("<MouseWheel>", _on_mousewheel))
+fft_canvas.bind("<Leave>", lambda e: fft_canvas.unbind_all("<MouseWheel>"))
 
-fft_canvas.create_window((0, 0), window=fft_scrollable_frame, anchor="nw")
 fft_canvas.configure(yscrollcommand=fft_scrollbar.set)
+
+def _on_fft_canvas_configure(event):
+    # plain int shared with the render workers, which size plots off the Tk thread
+    global fft_view_width
+    fft_view_width = event.width - 2 * FFT_IMG_PAD
+fft_canvas.bind("<Configure>", _on_fft_canvas_configure)
 fft_canvas.pack(side="left", fill="both", expand=True)
 fft_scrollbar.pack(side="right", fill="y")
 
@@ -0,0 +1,55 @@
+"""
+adc_to_fft.py - ADC -> FFT conversion used by the "ADC to FFT *" notebooks
+
+Same processing as the notebooks, as plain functions so the GUI can run it without a kernel:
+- load every Red Pitaya CSV in a folder and keep the ADC samples (column 16 onwards)
+- 5th-order Butterworth low-pass (30 kHz), applied forward-backward to every row at once
+- mean of each row, Hanning window, FFT over the sequence of row means
+- save an (N, 4) array: Frequency, FFT Magnitude, Phase, label
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.signal import butter, sosfiltfilt
+
+ADC_FIRST_COLUMN = 16       # columns before this are measurement metadata
+SAMPLING_RATE = 1953125     # Hz, used for the frequency axis
+FILTER_CUTOFF = 30e3        # Hz
+FILTER_FS = 1e6             # Hz, sampling rate the notebooks' filter was designed for
+FILTER_ORDER = 5
+
+
+def load_adc(data_dir):
+    """ADC samples of every .csv in data_dir, stacked row-wise (files in name order)."""
+    csv_files = sorted(os.path.join(data_dir, f) for f in os.listdir(data_dir) if f.endswith(".csv"))
+    if not csv_files:
+        raise FileNotFoundError(f"No CSV files in {data_dir}")
+    combined_df = pd.concat([pd.read_csv(f, header=None) for f in csv_files], ignore_index=True)
+    return combined_df.iloc[:, ADC_FIRST_COLUMN:].to_numpy(dtype=np.float64)
+
+
+def lowpass(adc_data, cutoff=FILTER_CUTOFF, fs=FILTER_FS, order=FILTER_ORDER):
+    """Zero-phase Butterworth low-pass of every row (second-order sections, one call)."""
+    sos = butter(order, cutoff / (0.5 * fs), btype="low", output="sos")
+    return sosfiltfilt(sos, adc_data, axis=1)
+
+
+def adc_to_fft(adc_data, label_value, sampling_rate=SAMPLING_RATE):
+    """Filtered ADC rows -> (N, 4) array of frequency, magnitude, phase and label."""
+    row_means = lowpass(adc_data).mean(axis=1)
+    fft_result = np.fft.fft(row_means * np.hanning(len(row_means)))
+    freq = np.fft.fftfreq(len(row_means), d=1 / sampling_rate)
+    label = np.full(len(row_means), label_value, dtype=np.float64)
+    return np.column_stack((freq, np.abs(fft_result), np.angle(fft_result), label))
+
+
+def convert(data_dir, out_path, label_value):
+    """Convert the CSVs in data_dir and save the result to out_path (.npy)."""
+    fft_array = adc_to_fft(load_adc(data_dir), label_value)
+    # write next to the target and rename, so readers never see a half-written array
+    tmp_path = f"{out_path}.tmp.npy"
+    np.save(tmp_path, fft_array)
+    os.replace(tmp_path, out_path)
+    return fft_array